@@ -1,6 +1,8 @@
 # nsw_dashboard.py - Complete NSW Interactive Mapping Dashboard
 import ipyleaflet
-from ipyleaflet import Map, GeoJSON, Choropleth, LayersControl, FullScreenControl
+from ipyleaflet import (
+    Map, GeoJSON, Choropleth, LayersControl, FullScreenControl, TileLayer
+)
 from ipywidgets import (
     VBox, HBox, Dropdown, IntSlider, SelectMultiple,
     Button, Output, HTML, Layout, GridspecLayout
@@ -8,15 +10,67 @@ from ipywidgets import (
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+from shapely import set_precision
+from shapely.geometry import Point
 import json
+import os
+import threading
 import requests
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; the kernel below still runs as plain Python
+    njit = None
+
+def _colorize(vals, min_val, max_val, n_colors, out_idx):
+    """Write color-ramp indices for each value into out_idx
+
+    NaN values (unmatched LGAs) get the sentinel index n_colors.
+    """
+    span = max_val - min_val
+    for i in range(len(vals)):
+        v = vals[i]
+        if v != v:
+            out_idx[i] = n_colors
+            continue
+        if span > 0:
+            norm = (v - min_val) / span
+        else:
+            norm = 0.5
+        idx = int(norm * (n_colors - 1))
+        if idx < 0:
+            idx = 0
+        elif idx > n_colors - 1:
+            idx = n_colors - 1
+        out_idx[i] = idx
+
+if njit is not None:
+    _colorize = njit(cache=True, fastmath=True)(_colorize)
+
+# Expensive immutable geo state (boundaries and simplified geometry
+# variants) built once per process and shared by every dashboard
+# instance, so preheated Voila kernels skip the rebuild
+_geo_lock = threading.Lock()
+_geo_cache = {}
+
 class NSWMappingDashboard:
     """Interactive mapping dashboard for NSW data visualization"""
 
+    # Simplification tolerance (degrees) per zoom bucket; 0 keeps the
+    # geometry as loaded (load_boundaries already thins to 0.0008)
+    ZOOM_TOLERANCES = [(7, 0.01), (9, 0.003), (11, 0)]
+
+    # Color gradient from light yellow to dark red
+    COLORS = ['#FFEDA0', '#FED976', '#FEB24C', '#FD8D3C',
+              '#FC4E2A', '#E31A1C', '#BD0026', '#800026']
+
+    # Neutral fill for regions with no data for the selected metric
+    NO_DATA_COLOR = '#cccccc'
+
     def __init__(self):
         # NSW center coordinates (Sydney)
         self.nsw_center = (-33.8688, 151.2093)
@@ -32,27 +86,33 @@ class NSWMappingDashboard:
 
     def setup_data(self):
         """Load NSW boundaries and sample demographic data"""
-        # Load NSW LGA boundaries
+        # Load NSW LGA boundaries; propertyName/bbox make the WFS server
+        # drop unused attributes and features before they hit the wire
         # In production, replace with actual NSW boundary file
-        self.lga_url = "https://data.gov.au/geoserver/nsw-local-government-areas/wfs?request=GetFeature&typeName=ckan_1_f64b8c4dd871409d92a4ae7ed8365786&outputFormat=json"
+        self.lga_url = (
+            "https://data.gov.au/geoserver/nsw-local-government-areas/wfs"
+            "?request=GetFeature"
+            "&typeName=ckan_1_f64b8c4dd871409d92a4ae7ed8365786"
+            "&outputFormat=json"
+            "&propertyName=nsw_lga__3,geometry"
+            "&srsName=EPSG:4326"
+            "&bbox=140,-38,154,-28,EPSG:4326"
+        )
 
         try:
-            # Load LGA boundaries
-            self.nsw_lga = gpd.read_file(self.lga_url)
-
-            # Ensure correct CRS for web mapping
-            if self.nsw_lga.crs != 'EPSG:4326':
-                self.nsw_lga = self.nsw_lga.to_crs('EPSG:4326')
+            # Load LGA boundaries once per process; later instances (e.g.
+            # in preheated kernels) reuse the shared frame
+            with _geo_lock:
+                if 'nsw_lga' not in _geo_cache:
+                    _geo_cache['nsw_lga'] = self.load_boundaries()
+            self.nsw_lga = _geo_cache['nsw_lga']
 
             # Create sample demographic data
             self.demographic_data = self.create_sample_demographics()
 
             # Merge geographic and demographic data
-            self.merged_data = self.nsw_lga.merge(
-                self.demographic_data,
-                left_on='nsw_lga__3',
-                right_on='lga_name',
-                how='left'
+            self.merged_data = self.merge_demographics(
+                self.nsw_lga, self.demographic_data
             )
 
         except Exception as e:
@@ -60,6 +120,70 @@ class NSWMappingDashboard:
             # Create fallback sample data
             self.create_fallback_data()
 
+        # The simplified zoom variants depend only on the (immutable)
+        # geometry, so they are built once and shared process-wide --
+        # but only when this instance uses the shared boundaries; the
+        # fallback path keeps its toy geometry to itself so it cannot
+        # poison a later instance that loads the real data
+        if self.nsw_lga is _geo_cache.get('nsw_lga'):
+            with _geo_lock:
+                if 'geom_by_zoom' not in _geo_cache:
+                    _geo_cache['geom_by_zoom'] = self.build_zoom_geometries()
+            self._geom_by_zoom = _geo_cache['geom_by_zoom']
+        else:
+            self._geom_by_zoom = self.build_zoom_geometries()
+
+        # Centroid array for nearest-centroid click hit-testing: accurate
+        # enough for the info panel and far cheaper than polygon tests
+        centroids = self.merged_data.geometry.centroid
+        self._centroids = np.stack(
+            [centroids.x.to_numpy(np.float32),
+             centroids.y.to_numpy(np.float32)], axis=1
+        )
+
+        # Serialized GeoJSON keyed by (region selection, zoom bucket);
+        # only invalidated when the underlying data is reloaded here
+        self._geojson_cache = {}
+
+    def load_boundaries(self):
+        """Load LGA boundaries through a weekly GeoParquet cache"""
+        cache_dir = os.path.join(
+            os.path.expanduser('~'), '.cache', 'nsw_dashboard'
+        )
+        os.makedirs(cache_dir, exist_ok=True)
+        week = datetime.now().strftime('%Yw%W')
+        cache_file = os.path.join(cache_dir, f'nsw_lga_{week}.parquet')
+
+        if os.path.exists(cache_file):
+            return gpd.read_parquet(cache_file)
+
+        # pyogrio reads the layer as Arrow batches in C instead of
+        # feature-by-feature Python dicts
+        nsw_lga = gpd.read_file(self.lga_url, engine='pyogrio',
+                                use_arrow=True)
+
+        # Ensure correct CRS for web mapping
+        if nsw_lga.crs != 'EPSG:4326':
+            nsw_lga = nsw_lga.to_crs('EPSG:4326')
+
+        # Thin to the finest tolerance any zoom bucket uses and keep only
+        # the columns the dashboard reads
+        nsw_lga = nsw_lga[['nsw_lga__3', 'geometry']]
+        nsw_lga.geometry = nsw_lga.geometry.simplify(
+            0.0008, preserve_topology=True
+        )
+
+        # Normalize the join key here, once, so downstream merges never
+        # have to touch the shared frame
+        nsw_lga['lga_name'] = nsw_lga['nsw_lga__3'].str.strip().str.lower()
+
+        # Write-then-rename so concurrently starting kernels never read
+        # a truncated file
+        tmp = f'{cache_file}.{os.getpid()}.tmp'
+        nsw_lga.to_parquet(tmp, compression='zstd')
+        os.replace(tmp, cache_file)
+        return nsw_lga
+
     def create_sample_demographics(self):
         """Generate sample demographic data for NSW LGAs"""
         # Sample LGA names from NSW
@@ -74,13 +198,20 @@ class NSWMappingDashboard:
 
         np.random.seed(42)
 
+        # 4-byte dtypes halve the scan bandwidth of every downstream
+        # reduction, sort and serialization
         data = {
             'lga_name': lga_names,
-            'population': np.random.randint(50000, 500000, len(lga_names)),
-            'median_income': np.random.randint(40000, 120000, len(lga_names)),
-            'unemployment_rate': np.random.uniform(2, 8, len(lga_names)),
-            'housing_median': np.random.randint(400000, 2000000, len(lga_names)),
-            'crime_rate': np.random.uniform(20, 100, len(lga_names))
+            'population': np.random.randint(
+                50000, 500000, len(lga_names), dtype=np.int32),
+            'median_income': np.random.randint(
+                40000, 120000, len(lga_names), dtype=np.int32),
+            'unemployment_rate': np.random.uniform(
+                2, 8, len(lga_names)).astype(np.float32),
+            'housing_median': np.random.randint(
+                400000, 2000000, len(lga_names), dtype=np.int32),
+            'crime_rate': np.random.uniform(
+                20, 100, len(lga_names)).astype(np.float32)
         }
 
         return pd.DataFrame(data)
@@ -88,8 +219,6 @@ class NSWMappingDashboard:
     def create_fallback_data(self):
         """Create fallback data if API is unavailable"""
         # Create simple polygon data for demonstration
-        from shapely.geometry import Point
-
         # Major NSW cities with approximate coordinates
         cities = {
             'Sydney': (-33.8688, 151.2093),
@@ -114,20 +243,120 @@ class NSWMappingDashboard:
         # Create demographic data
         self.demographic_data = pd.DataFrame({
             'lga_name': list(cities.keys()),
-            'population': np.random.randint(20000, 500000, len(cities)),
-            'median_income': np.random.randint(40000, 100000, len(cities)),
-            'unemployment_rate': np.random.uniform(2, 8, len(cities)),
-            'housing_median': np.random.randint(300000, 1500000, len(cities)),
-            'crime_rate': np.random.uniform(20, 100, len(cities))
+            'population': np.random.randint(
+                20000, 500000, len(cities), dtype=np.int32),
+            'median_income': np.random.randint(
+                40000, 100000, len(cities), dtype=np.int32),
+            'unemployment_rate': np.random.uniform(
+                2, 8, len(cities)).astype(np.float32),
+            'housing_median': np.random.randint(
+                300000, 1500000, len(cities), dtype=np.int32),
+            'crime_rate': np.random.uniform(
+                20, 100, len(cities)).astype(np.float32)
         })
 
-        self.merged_data = self.nsw_lga.merge(
-            self.demographic_data,
-            left_on='nsw_lga__3',
-            right_on='lga_name',
-            how='left'
+        self.merged_data = self.merge_demographics(
+            self.nsw_lga, self.demographic_data
+        )
+
+    @staticmethod
+    def merge_demographics(nsw_lga, demographic_data):
+        """Join demographics onto the LGA boundaries on a normalized key"""
+        # Normalize the join key on both sides so the merge is one hash
+        # join on identical strings instead of silently dropping rows;
+        # assign copies rather than mutating (the boundary frame may be
+        # the process-wide shared one, which already carries the key)
+        if 'lga_name' not in nsw_lga.columns:
+            nsw_lga = nsw_lga.assign(
+                lga_name=nsw_lga['nsw_lga__3'].str.strip().str.lower()
+            )
+        demographic_data = demographic_data.assign(
+            lga_name=demographic_data['lga_name'].str.strip().str.lower()
+        )
+
+        merged = nsw_lga.merge(
+            demographic_data,
+            on='lga_name',
+            how='left',
+            validate='one_to_one',
+            copy=False
         )
 
+        # A left merge promotes int columns with misses to float64; pull
+        # everything float back down to 4 bytes
+        float_cols = merged.select_dtypes(include='float64').columns
+        merged[float_cols] = merged[float_cols].astype('float32', copy=False)
+
+        # Restore display casing, then index on the key so region filters
+        # can use O(k) label lookups instead of full-column scans
+        merged['lga_name'] = merged['lga_name'].str.title().astype('category')
+        merged.set_index('lga_name', drop=False, inplace=True)
+        merged.index.name = None
+
+        return merged
+
+    def select_regions(self):
+        """Resolve the region filter to a view of the merged data"""
+        if 'All' in self.region_filter.value:
+            return self.merged_data
+        return self.merged_data.loc[list(self.region_filter.value)]
+
+    def summarize_metric(self, selected_data):
+        """Compute metric statistics and the top-20 slice in one pass"""
+        metric = self.metric_dropdown.value
+        col = selected_data[metric].to_numpy()
+
+        stats = {
+            'mean': np.nanmean(col),
+            'median': np.nanmedian(col),
+            'min': np.nanmin(col),
+            'max': np.nanmax(col),
+            'count': len(col)
+        }
+
+        # nlargest partitions in O(N) and sorts only the top rows
+        return stats, selected_data.nlargest(20, metric)
+
+    def build_zoom_geometries(self):
+        """Precompute simplified geometry variants per zoom bucket"""
+        geom_by_zoom = {}
+        for bucket, tolerance in self.ZOOM_TOLERANCES:
+            geometry = self.merged_data.geometry
+            if tolerance:
+                geometry = geometry.simplify(tolerance, preserve_topology=True)
+
+            # Snap coordinates to ~5 decimals so to_json emits short floats
+            snapped = set_precision(geometry.values, grid_size=1e-5)
+            geom_by_zoom[bucket] = gpd.GeoSeries(
+                snapped, index=geometry.index, crs=geometry.crs
+            )
+
+        return geom_by_zoom
+
+    def prerender_tiles(self, metrics=None, zooms=range(6, 11)):
+        """Prerender choropleth tiles into cache/tiles for the given
+        metrics (all dropdown metrics by default)
+
+        Optional startup step; update_choropleth serves the tiles
+        whenever they exist for the selected metric.
+        """
+        from performance_utils import PerformanceOptimizer
+
+        if metrics is None:
+            metrics = [value for _, value in self.metric_dropdown.options]
+        for metric in metrics:
+            PerformanceOptimizer.build_tile_cache(
+                self.merged_data, metric, self.COLORS,
+                no_data_color=self.NO_DATA_COLOR, zooms=zooms
+            )
+
+    def zoom_bucket(self, zoom):
+        """Map the current map zoom to the nearest precomputed bucket"""
+        for bucket, _ in self.ZOOM_TOLERANCES:
+            if zoom <= bucket:
+                return bucket
+        return self.ZOOM_TOLERANCES[-1][0]
+
     def create_widgets(self):
         """Create interactive control widgets"""
         # Metric selection dropdown
@@ -195,7 +424,20 @@ class NSWMappingDashboard:
         self.map.add_control(FullScreenControl())
         self.map.add_control(LayersControl(position='topright'))
 
-        # Initial choropleth layer
+        # Single persistent choropleth layer; updates mutate its data and
+        # style callback instead of removing and re-adding the layer
+        self._choropleth = GeoJSON(
+            data={'type': 'FeatureCollection', 'features': []},
+            hover_style={'fillOpacity': 0.9, 'weight': 2},
+            name='Choropleth'
+        )
+        self.map.add_layer(self._choropleth)
+
+        # Overlay for prerendered choropleth tiles, created lazily when a
+        # tile cache exists for the selected metric
+        self._tile_layer = None
+
+        # Initial choropleth render
         self.update_choropleth()
 
         # Map interaction handler
@@ -210,97 +452,119 @@ class NSWMappingDashboard:
         with self.table_output:
             self.update_table()
 
-    def update_choropleth(self):
+    def update_choropleth(self, filtered_data=None):
         """Update the choropleth layer based on selected metric"""
-        # Clear existing layers
-        for layer in self.map.layers[1:]:  # Keep base layer
-            if isinstance(layer, GeoJSON):
-                self.map.remove_layer(layer)
-
         # Get selected metric
         metric = self.metric_dropdown.value
 
-        # Filter data based on region selection
-        if 'All' not in self.region_filter.value:
-            filtered_data = self.merged_data[
-                self.merged_data['lga_name'].isin(self.region_filter.value)
-            ]
-        else:
-            filtered_data = self.merged_data
+        # Prefer prerendered XYZ tiles when a cache exists for this
+        # metric: the browser then fetches a few small PNGs per viewport
+        # instead of the whole polygon set on every update
+        tile_dir = os.path.join('cache', 'tiles', metric)
+        if 'All' in self.region_filter.value and os.path.isdir(tile_dir):
+            # Jupyter and Voila both serve notebook-dir files under
+            # /files/, so the browser can actually fetch these
+            url = f'/files/cache/tiles/{metric}' + '/{z}/{x}/{y}.png'
+            if self._tile_layer is None:
+                self._tile_layer = TileLayer(
+                    url=url, name='Choropleth tiles', opacity=0.9
+                )
+                self.map.add_layer(self._tile_layer)
+            else:
+                self._tile_layer.url = url
+            self._choropleth.data = {'type': 'FeatureCollection',
+                                     'features': []}
+            return
+        if self._tile_layer is not None:
+            self.map.remove_layer(self._tile_layer)
+            self._tile_layer = None
+
+        # Filter data based on region selection unless the caller already
+        # resolved the shared selection
+        if filtered_data is None:
+            filtered_data = self.select_regions()
 
         # Create color mapping
         if len(filtered_data) > 0 and metric in filtered_data.columns:
             min_val = filtered_data[metric].min()
             max_val = filtered_data[metric].max()
 
-            # Create GeoJSON with properties
-            geojson_data = json.loads(filtered_data.to_json())
-
-            # Style function
-            def style_function(feature):
-                value = feature['properties'].get(metric, 0)
-                # Normalize value for color mapping
-                if max_val > min_val:
-                    normalized = (value - min_val) / (max_val - min_val)
-                else:
-                    normalized = 0.5
+            # Serialize geometry only once per (region selection, zoom
+            # bucket); metric values are patched into properties below
+            bucket = self.zoom_bucket(self.map.zoom)
+            cache_key = (tuple(sorted(self.region_filter.value)), bucket)
+            if cache_key not in self._geojson_cache:
+                geo_only = filtered_data[['lga_name', 'geometry']].assign(
+                    geometry=self._geom_by_zoom[bucket].loc[filtered_data.index]
+                )
+                self._geojson_cache[cache_key] = json.loads(geo_only.to_json())
+            geojson_data = self._geojson_cache[cache_key]
+
+            # Bucketize the metric into the color ramp with the compiled
+            # kernel, then map indices back to hex strings
+            vals = filtered_data[metric].to_numpy(dtype=np.float32)
+            color_idx = np.empty(len(vals), dtype=np.uint8)
+            _colorize(vals, np.float32(min_val), np.float32(max_val),
+                      len(self.COLORS), color_idx)
+            fill_colors = [
+                self.COLORS[i] if i < len(self.COLORS) else self.NO_DATA_COLOR
+                for i in color_idx
+            ]
 
-                # Color gradient from light yellow to dark red
-                color = self.get_color(normalized)
+            # Cheap per-feature dict update instead of re-serializing;
+            # NaN is not valid JSON, so emit None like to_json did
+            for i, feature in enumerate(geojson_data['features']):
+                value = vals[i].item()
+                feature['properties'][metric] = (
+                    None if value != value else value
+                )
+                feature['properties']['_fill'] = fill_colors[i]
 
+            # Style function only has to read the precomputed fill color
+            def style_function(feature):
                 return {
-                    'fillColor': color,
+                    'fillColor': feature['properties']['_fill'],
                     'color': 'black',
                     'weight': 1,
                     'fillOpacity': 0.7
                 }
 
-            # Create GeoJSON layer
-            geojson_layer = GeoJSON(
-                data=geojson_data,
-                style={'style_function': style_function},
-                hover_style={'fillOpacity': 0.9, 'weight': 2},
-                name=f'{self.metric_dropdown.label} Choropleth'
-            )
-
-            self.map.add_layer(geojson_layer)
+            # Mutate the persistent layer in place
+            self._choropleth.style_callback = style_function
+            self._choropleth.data = geojson_data
+            self._choropleth.name = f'{self.metric_dropdown.label} Choropleth'
 
     def get_color(self, value):
         """Get color for normalized value (0-1)"""
-        # Color gradient from light yellow to dark red
-        colors = ['#FFEDA0', '#FED976', '#FEB24C', '#FD8D3C',
-                  '#FC4E2A', '#E31A1C', '#BD0026', '#800026']
-
-        index = int(value * (len(colors) - 1))
-        return colors[min(index, len(colors) - 1)]
+        index = int(value * (len(self.COLORS) - 1))
+        return self.COLORS[min(index, len(self.COLORS) - 1)]
 
-    def update_table(self):
+    def update_table(self, selected_data=None, top_rows=None):
         """Update the data table display"""
         self.table_output.clear_output()
 
         with self.table_output:
-            # Filter data
-            if 'All' not in self.region_filter.value:
-                display_data = self.merged_data[
-                    self.merged_data['lga_name'].isin(self.region_filter.value)
-                ][['lga_name', 'population', 'median_income',
-                   'unemployment_rate', 'housing_median', 'crime_rate']]
-            else:
-                display_data = self.merged_data[
-                    ['lga_name', 'population', 'median_income',
-                     'unemployment_rate', 'housing_median', 'crime_rate']
-                ]
-
-            # Sort by selected metric
-            display_data = display_data.sort_values(
-                self.metric_dropdown.value,
-                ascending=False
-            ).head(20)
-
-            # Format display
-            display_html = display_data.to_html(
+            # Use the shared top-N slice when the caller computed it
+            if top_rows is None:
+                if selected_data is None:
+                    selected_data = self.select_regions()
+                _, top_rows = self.summarize_metric(selected_data)
+
+            display_data = top_rows[
+                ['lga_name', 'population', 'median_income',
+                 'unemployment_rate', 'housing_median', 'crime_rate']
+            ]
+
+            # Format whole columns at once rather than dispatching a
+            # Python lambda per cell through float_format
+            formatted = display_data.copy()
+            for col in ['population', 'median_income', 'housing_median']:
+                formatted[col] = formatted[col].map('{:,.0f}'.format)
+            for col in ['unemployment_rate', 'crime_rate']:
+                formatted[col] = formatted[col].map('{:.1f}'.format)
+
+            display_html = formatted.to_html(
                 index=False,
-                float_format=lambda x: f'{x:,.0f}' if x > 100 else f'{x:.1f}',
                 classes='table table-striped table-hover',
                 table_id='data-table'
             )
@@ -325,26 +589,20 @@ class NSWMappingDashboard:
 
             display(HTML(styled_html))
 
-    def update_stats(self):
+    def update_stats(self, stats_data=None, stats=None):
         """Update statistics display"""
         self.stats_output.clear_output()
 
         with self.stats_output:
             # Calculate statistics
-            if 'All' not in self.region_filter.value:
-                stats_data = self.merged_data[
-                    self.merged_data['lga_name'].isin(self.region_filter.value)
-                ]
-            else:
-                stats_data = self.merged_data
+            if stats_data is None:
+                stats_data = self.select_regions()
 
             metric = self.metric_dropdown.value
 
             if len(stats_data) > 0 and metric in stats_data.columns:
-                mean_val = stats_data[metric].mean()
-                median_val = stats_data[metric].median()
-                min_val = stats_data[metric].min()
-                max_val = stats_data[metric].max()
+                if stats is None:
+                    stats, _ = self.summarize_metric(stats_data)
 
                 stats_html = f"""
                 <div style="background: #f8f9fa; padding: 15px; border-radius: 5px;">
@@ -352,24 +610,24 @@ class NSWMappingDashboard:
                     <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px;">
                         <div>
                             <strong>Mean:</strong><br>
-                            {mean_val:,.0f}
+                            {stats['mean']:,.0f}
                         </div>
                         <div>
                             <strong>Median:</strong><br>
-                            {median_val:,.0f}
+                            {stats['median']:,.0f}
                         </div>
                         <div>
                             <strong>Min:</strong><br>
-                            {min_val:,.0f}
+                            {stats['min']:,.0f}
                         </div>
                         <div>
                             <strong>Max:</strong><br>
-                            {max_val:,.0f}
+                            {stats['max']:,.0f}
                         </div>
                     </div>
                     <p style="margin-top: 10px; color: #666;">
                         Year: {self.year_slider.value} |
-                        Regions: {len(stats_data)} selected
+                        Regions: {stats['count']} selected
                     </p>
                 </div>
                 """
@@ -380,12 +638,16 @@ class NSWMappingDashboard:
         """Handle map click events"""
         lat, lon = coordinates
 
-        # Find clicked region (simplified - in production use proper point-in-polygon)
+        # Nearest centroid is sufficient for UI hit-testing: a single
+        # vectorized distance pass, no polygon math at all
+        d2 = ((self._centroids[:, 0] - lon) ** 2
+              + (self._centroids[:, 1] - lat) ** 2)
+        idx = int(d2.argmin())
+
+        # Ignore clicks nowhere near a region (e.g. out at sea)
         clicked_region = None
-        for idx, row in self.merged_data.iterrows():
-            if row.geometry and row.geometry.contains(Point(lon, lat)):
-                clicked_region = row
-                break
+        if d2[idx] < 4.0:
+            clicked_region = self.merged_data.iloc[idx]
 
         if clicked_region is not None:
             info_text = f"""
@@ -405,9 +667,13 @@ class NSWMappingDashboard:
     def connect_events(self):
         """Connect widget events to update functions"""
         def update_all(change=None):
-            self.update_choropleth()
-            self.update_table()
-            self.update_stats()
+            # Resolve the region selection once, then compute the stats
+            # and top-N slice together and share them across renderers
+            selected = self.select_regions()
+            stats, top_rows = self.summarize_metric(selected)
+            self.update_choropleth(selected)
+            self.update_table(selected, top_rows)
+            self.update_stats(selected, stats)
 
         # Connect widgets
         self.metric_dropdown.observe(update_all, 'value')
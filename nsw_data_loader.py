@@ -2,7 +2,13 @@
 import requests
 import pandas as pd
 import geopandas as gpd
-from functools import lru_cache
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# On-disk cache shared by all kernels on the host
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'nsw_dashboard')
 
 class NSWDataLoader:
     """Load and process NSW government open data"""
@@ -10,27 +16,53 @@ class NSWDataLoader:
     def __init__(self):
         self.base_url = "https://data.nsw.gov.au/data/api/3/action/"
 
-    @lru_cache(maxsize=32)
+    def _cached(self, key, ttl, loader):
+        """Fetch a DataFrame through the on-disk Parquet cache
+
+        Results are keyed by a hash of `key` and stay fresh for `ttl`
+        seconds, so they survive kernel restarts and actually expire --
+        unlike an in-process lru_cache holding mutable responses.
+        """
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = os.path.join(
+            CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.parquet'
+        )
+
+        if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+            return pd.read_parquet(path)
+
+        result = loader()
+        if isinstance(result, pd.DataFrame):
+            # Write-then-rename so concurrently starting kernels never
+            # read a truncated file
+            tmp = f'{path}.{os.getpid()}.tmp'
+            result.to_parquet(tmp, compression='zstd')
+            os.replace(tmp, path)
+        return result
+
     def get_transport_data(self):
         """Fetch real-time transport data from Transport NSW"""
         # Note: Requires API key from https://opendata.transport.nsw.gov.au/
-        headers = {
-            'Authorization': 'apikey YOUR_API_KEY'
-        }
-
         # Example: Get real-time vehicle positions
         url = "https://api.transport.nsw.gov.au/v1/gtfs/vehiclepos/buses"
 
-        try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                return self.parse_gtfs_realtime(response.content)
-        except Exception as e:
-            print(f"Error fetching transport data: {e}")
+        def fetch():
+            headers = {
+                'Authorization': 'apikey YOUR_API_KEY'
+            }
 
-        return None
+            try:
+                response = requests.get(url, headers=headers)
+                if response.status_code == 200:
+                    return self.parse_gtfs_realtime(response.content)
+            except Exception as e:
+                print(f"Error fetching transport data: {e}")
+
+            return None
+
+        # Vehicle positions go stale quickly; keep for one minute
+        return self._cached(url, ttl=60, loader=fetch)
 
-    @lru_cache(maxsize=32)
     def get_crime_statistics(self, year=2024):
         """Fetch NSW crime statistics by LGA"""
         # Crime data from BOCSAR
@@ -38,16 +70,20 @@ class NSWDataLoader:
 
         url = f"{self.base_url}package_show?id={dataset_id}"
 
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                # Process and return crime data
-                return self.process_crime_data(data)
-        except Exception as e:
-            print(f"Error fetching crime data: {e}")
+        def fetch():
+            try:
+                response = requests.get(url)
+                if response.status_code == 200:
+                    data = response.json()
+                    # Process and return crime data
+                    return self.process_crime_data(data)
+            except Exception as e:
+                print(f"Error fetching crime data: {e}")
 
-        return None
+            return None
+
+        # Crime tables update infrequently; refresh daily
+        return self._cached(f"{url}&year={year}", ttl=86400, loader=fetch)
 
     def get_health_statistics(self):
         """Fetch health statistics from HealthStats NSW"""
@@ -84,23 +120,38 @@ class NSWDataDashboard(NSWMappingDashboard):
 
     def setup_data(self):
         """Override to load real NSW data"""
-        # Load boundaries
-        super().setup_data()
+        # Kick off the independent fetches in parallel so cold start pays
+        # the slowest latency instead of the sum of all of them
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            crime_future = executor.submit(
+                self.data_loader.get_crime_statistics
+            )
+            health_future = executor.submit(
+                self.data_loader.get_health_statistics
+            )
+
+            # Boundaries load on the main thread while the above overlap
+            super().setup_data()
 
-        # Enhance with real data
-        crime_data = self.data_loader.get_crime_statistics()
-        health_data = self.data_loader.get_health_statistics()
+            crime_data = crime_future.result()
+            health_data = health_future.result()
 
-        if crime_data is not None:
+        # Skip missing or empty frames (nothing to join) and restore the
+        # lga_name index that a column-on-column merge resets
+        enhanced = False
+        for extra in (crime_data, health_data):
+            if extra is None or len(extra) == 0:
+                continue
             self.merged_data = self.merged_data.merge(
-                crime_data,
+                extra,
                 on='lga_name',
                 how='left'
             )
+            enhanced = True
 
-        if health_data is not None:
-            self.merged_data = self.merged_data.merge(
-                health_data,
-                on='lga_name',
-                how='left'
-            )
\ No newline at end of file
+        if enhanced:
+            self.merged_data['lga_name'] = (
+                self.merged_data['lga_name'].astype('category')
+            )
+            self.merged_data.set_index('lga_name', drop=False, inplace=True)
+            self.merged_data.index.name = None
\ No newline at end of file
@@ -1,28 +1,40 @@
 # performance_utils.py - Performance optimization utilities
-from functools import lru_cache
-import pickle
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+
+# Standalone Agg figures are self-contained (no pyplot global state),
+# which keeps tile rendering thread-safe
+from matplotlib.figure import Figure
+
+# Prerendered choropleth tiles live here as {metric}/{z}/{x}/{y}.png
+TILE_CACHE_DIR = os.path.join('cache', 'tiles')
 
 class PerformanceOptimizer:
     """Utilities for optimizing dashboard performance"""
 
     @staticmethod
-    @lru_cache(maxsize=128)
-    def load_cached_boundaries(cache_file='nsw_boundaries.pkl'):
-        """Load boundaries with caching"""
+    def load_cached_boundaries(cache_file='nsw_boundaries.parquet'):
+        """Load boundaries with on-disk GeoParquet caching
+
+        GeoParquet decodes geometry in bulk (no per-object pickle
+        overhead) and stays readable across geopandas/shapely versions.
+        """
         if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
+            return gpd.read_parquet(cache_file)
 
         # Load from source
-        gdf = gpd.read_file("YOUR_BOUNDARY_URL")
+        gdf = gpd.read_file("YOUR_BOUNDARY_URL", engine='pyogrio',
+                            use_arrow=True)
 
         # Simplify for web display
         gdf['geometry'] = gdf['geometry'].simplify(tolerance=0.001)
 
         # Cache for future use
-        with open(cache_file, 'wb') as f:
-            pickle.dump(gdf, f)
+        gdf.to_parquet(cache_file, compression='zstd')
 
         return gdf
 
@@ -31,6 +43,104 @@ class PerformanceOptimizer:
         """Create spatial index for faster queries"""
         return gdf.sindex
 
+    @staticmethod
+    def tile_bounds(z, x, y):
+        """Lon/lat bounds (w, s, e, n) of an XYZ tile in Web Mercator"""
+        n = 2 ** z
+        lon_w = x / n * 360.0 - 180.0
+        lon_e = (x + 1) / n * 360.0 - 180.0
+        lat_n = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+        lat_s = math.degrees(
+            math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n)))
+        )
+        return lon_w, lat_s, lon_e, lat_n
+
+    @staticmethod
+    def tiles_for_bounds(z, bounds):
+        """XYZ coordinates covering (minx, miny, maxx, maxy) at zoom z"""
+        minx, miny, maxx, maxy = bounds
+        n = 2 ** z
+
+        def tile_x(lon):
+            return int((lon + 180.0) / 360.0 * n)
+
+        def tile_y(lat):
+            lat_r = math.radians(lat)
+            return int((1 - math.asinh(math.tan(lat_r)) / math.pi) / 2 * n)
+
+        for x in range(max(tile_x(minx), 0), min(tile_x(maxx), n - 1) + 1):
+            for y in range(max(tile_y(maxy), 0),
+                           min(tile_y(miny), n - 1) + 1):
+                yield x, y
+
+    @staticmethod
+    def render_tile(gdf, z, x, y, path):
+        """Rasterize pre-colored polygons into one 256x256 PNG tile
+
+        Expects a `_fill` column holding the per-feature hex color.
+        """
+        lon_w, lat_s, lon_e, lat_n = PerformanceOptimizer.tile_bounds(z, x, y)
+        clipped = gdf.cx[lon_w:lon_e, lat_s:lat_n]
+
+        fig = Figure(figsize=(1, 1), dpi=256)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()
+        ax.set_xlim(lon_w, lon_e)
+        ax.set_ylim(lat_s, lat_n)
+
+        if len(clipped) > 0:
+            clipped.plot(ax=ax, color=clipped['_fill'],
+                         edgecolor='black', linewidth=0.3, alpha=0.7)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fig.savefig(path, transparent=True)
+
+    @staticmethod
+    def build_tile_cache(gdf, metric, colors, no_data_color='#cccccc',
+                         zooms=range(6, 11), cache_dir=TILE_CACHE_DIR):
+        """Prerender the choropleth for one metric as XYZ PNG tiles
+
+        Tiles are generated once and reused across sessions; the map
+        then fetches a handful of small PNGs per viewport instead of the
+        whole polygon set on every update.
+        """
+        vals = gdf[metric].to_numpy(dtype=np.float32)
+        min_val, max_val = np.nanmin(vals), np.nanmax(vals)
+        if max_val > min_val:
+            norm = (vals - min_val) / (max_val - min_val)
+        else:
+            norm = np.full(len(vals), 0.5, dtype=np.float32)
+
+        # Mask NaN before the int cast (NaN -> int is undefined) and give
+        # those features the same no-data fill as the vector path
+        nan_mask = np.isnan(norm)
+        idx = np.clip(
+            np.where(nan_mask, 0, norm * (len(colors) - 1)).astype(np.int32),
+            0, len(colors) - 1
+        )
+        fill = np.where(nan_mask, no_data_color, np.asarray(colors)[idx])
+        colored = gdf.assign(_fill=fill)
+
+        jobs = []
+        for z in zooms:
+            for x, y in PerformanceOptimizer.tiles_for_bounds(
+                    z, gdf.total_bounds):
+                path = os.path.join(
+                    cache_dir, metric, str(z), str(x), f'{y}.png'
+                )
+                if not os.path.exists(path):
+                    jobs.append((z, x, y, path))
+
+        # Render missing tiles across a thread pool; each job draws an
+        # independent Agg figure
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(
+                lambda job: PerformanceOptimizer.render_tile(colored, *job),
+                jobs
+            ))
+
+        return os.path.join(cache_dir, metric)
+
     @staticmethod
     def progressive_loading(gdf, zoom_level):
         """Load features based on zoom level"""
@@ -44,12 +154,4 @@ class PerformanceOptimizer:
             # Show all regions
             return gdf
 
-# Voila configuration for production
-# voila_config.py
-c.VoilaConfiguration.template = 'material'
-c.VoilaConfiguration.enable_nbextensions = True
-c.VoilaConfiguration.file_whitelist = ['.*\.(png|jpg|gif|svg|geojson|json)']
-
-# Enable kernel pooling for better performance
-c.VoilaConfiguration.preheat_kernel = True
-c.VoilaConfiguration.pool_size = 3
\ No newline at end of file
+# Voila configuration for production lives in voila_config.py
\ No newline at end of file
@@ -0,0 +1,9 @@
+# voila_config.py - Voila configuration for production
+# Run with: voila --config=voila_config.py dashboard.ipynb
+c.VoilaConfiguration.template = 'material'
+c.VoilaConfiguration.enable_nbextensions = True
+c.VoilaConfiguration.file_whitelist = ['.*\.(png|jpg|gif|svg|geojson|json)']
+
+# Enable kernel pooling for better performance
+c.VoilaConfiguration.preheat_kernel = True
+c.VoilaConfiguration.pool_size = 3